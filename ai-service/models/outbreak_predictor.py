@@ -4,6 +4,16 @@ Uses machine learning to predict disease outbreak risk based on environmental an
 """
 
 import os
+
+# Cap BLAS pools before numpy/sklearn import them: tree fits parallelize
+# through joblib/OpenMP, and per-process BLAS pools on top of that
+# oversubscribe container CPU quotas. OMP_NUM_THREADS is deliberately left
+# alone -- HistGradientBoosting parallelizes its binning through OpenMP.
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+
+import time
+import asyncio
 import joblib
 import pandas as pd
 import numpy as np
@@ -11,19 +21,152 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 import structlog
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+
+try:
+    import lz4  # noqa: F401 -- joblib's 'lz4' codec needs the package importable
+    _DUMP_COMPRESS = ('lz4', 3)
+except ImportError:
+    _DUMP_COMPRESS = 0
+
+# Route RandomForest fit/predict through Intel oneDAL's vectorized
+# kernels when scikit-learn-intelex is installed
+try:
+    from sklearnex import patch_sklearn
+    patch_sklearn(['random_forest_classifier', 'random_forest_regressor'])
+except ImportError:
+    pass
+
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder
 import warnings
 
-warnings.filterwarnings('ignore')
+try:
+    # Compiled hot-path helpers (see outbreak_predictor_hot.pyx); optional
+    import outbreak_predictor_hot as _hot
+except ImportError:
+    try:
+        # Resolve relative to this package when imported as models.outbreak_predictor
+        from . import outbreak_predictor_hot as _hot
+    except ImportError:
+        _hot = None
+
+try:
+    # Optional compiled tree inference: the trained model is exported as a
+    # shared library whose traversal is straight-line generated code
+    import treelite
+    import treelite_runtime
+    TREELITE_AVAILABLE = True
+except ImportError:
+    treelite = None
+    treelite_runtime = None
+    TREELITE_AVAILABLE = False
+
+try:
+    # Optional ONNX Runtime serving: fused, SIMD-vectorized tree kernels
+    # without the sklearn Python dispatch
+    import onnxruntime as ort
+    from skl2onnx import to_onnx
+    ONNX_AVAILABLE = True
+except ImportError:
+    ort = None
+    to_onnx = None
+    ONNX_AVAILABLE = False
+
+try:
+    # Optional GPU inference backend for large batched risk scans
+    import cupy as cp
+    from cuml import ForestInference
+    FIL_AVAILABLE = True
+except ImportError:
+    cp = None
+    ForestInference = None
+    FIL_AVAILABLE = False
 
 logger = structlog.get_logger()
 
+# Fixed category vocabularies; categorical columns are integer-coded so the
+# model consumes a single all-numeric matrix
+# Clock cache: the serving path doesn't need a fresh datetime per call;
+# entries refresh once their resolution window lapses
+_NOW_CACHE = {}
+
+def _cached_now(resolution: float = 0.1) -> datetime:
+    """datetime.now() memoized per resolution window (seconds)"""
+    now = time.monotonic()
+    entry = _NOW_CACHE.get(resolution)
+    if entry is None or now - entry[0] >= resolution:
+        entry = (now, datetime.now())
+        _NOW_CACHE[resolution] = entry
+    return entry[1]
+
+# Month-indexed lookup tables (slot 0 unused); higher seasonal risk in
+# certain months (e.g. flu season)
+_SEASONAL_RISK = (0.5, 0.8, 0.9, 0.7, 0.5, 0.4, 0.3, 0.2, 0.3, 0.4, 0.6, 0.7, 0.8)
+_SEASON_NAME = ('', 'winter', 'winter', 'spring', 'spring', 'spring',
+                'summer', 'summer', 'summer', 'fall', 'fall', 'fall', 'winter')
+
+# Static recommendation sets per risk level; frozen so no per-request
+# string/list literals are rebuilt
+_RECS_HIGH = (
+    "Issue immediate public health alert",
+    "Increase monitoring frequency",
+    "Implement containment measures",
+    "Notify health authorities",
+    "Consider temporary restrictions",
+)
+_RECS_MEDIUM = (
+    "Increase surveillance in the area",
+    "Monitor water quality closely",
+    "Prepare response protocols",
+    "Inform local health workers",
+    "Track symptom patterns",
+)
+_RECS_LOW = (
+    "Continue routine monitoring",
+    "Maintain current surveillance levels",
+    "Monitor for any changes",
+    "Keep response teams on standby",
+)
+
+# Risk class labels in model output order
+_RISK_LABELS = ('low', 'medium', 'high')
+
+# Sensor fields aggregated per request, in output order
+_SENSOR_FIELDS = ('ph', 'turbidity', 'temperature', 'tds')
+
+def _compile_sensor_aggregator():
+    """Generate a one-pass mean aggregator specialized for the sensor schema
+    
+    Emits a single function that accumulates a sum and count per field in
+    one loop over the readings (one dict lookup per field per reading) and
+    returns NaN for fields absent from every reading.
+    """
+    lines = ["def _agg(sensor_data):"]
+    for field in _SENSOR_FIELDS:
+        lines.append(f"    s_{field} = 0.0; n_{field} = 0")
+    lines.append("    for reading in sensor_data:")
+    for field in _SENSOR_FIELDS:
+        lines.append(f"        v = reading.get('{field}')")
+        lines.append("        if v is not None:")
+        lines.append(f"            s_{field} += v; n_{field} += 1")
+    means = ", ".join(
+        f"s_{field} / n_{field} if n_{field} else nan" for field in _SENSOR_FIELDS
+    )
+    lines.append(f"    return ({means})")
+    
+    namespace = {'nan': float('nan')}
+    exec(compile("\n".join(lines), '<sensor_agg>', 'exec'), namespace)
+    return namespace['_agg']
+
+_CATEGORY_LEVELS = {
+    'weather_conditions': ('sunny', 'rainy', 'cloudy', 'stormy'),
+    'location_type': ('urban', 'rural', 'suburban'),
+    'time_of_year': ('spring', 'summer', 'fall', 'winter'),
+}
+
 class OutbreakPredictor:
     """
     Outbreak prediction model using ensemble methods
@@ -41,6 +184,24 @@ class OutbreakPredictor:
         self.version = "1.0.0"
         self.last_trained = None
         
+        # Precomputed at load/train time so predict skips schema work
+        self._feature_index = None
+        self._row_dtype = None
+        self._row_np = None
+        self._row_view = None
+        
+        # Compiled Treelite predictor, loaded from the .so beside the pickle
+        self._tl_predictor = None
+        
+        # cuML ForestInference handle when a CUDA device is available
+        self._fil = None
+        
+        # ONNX Runtime session, preferred inference path when present
+        self._onnx_session = None
+        
+        # One-pass aggregator compiled for the fixed sensor schema
+        self._sensor_agg = _compile_sensor_aggregator()
+        
         # Risk level thresholds
         self.risk_thresholds = {
             'low': 0.3,
@@ -58,6 +219,24 @@ class OutbreakPredictor:
             'seasonal_factor': 0.10,
             'weather_conditions': 0.05
         }
+        
+        # SoA lookup table for contributing-factor checks: one vectorized
+        # compare replaces six dict lookups + Python comparisons per request
+        self._factor_keys = ('symptom_density', 'water_quality_score',
+                             'temperature_anomaly', 'population_density',
+                             'recent_outbreaks', 'seasonal_factor')
+        self._factor_defaults = (0.0, 7.0, 0.0, 0.0, 0.0, 0.5)
+        self._factor_thresholds = np.array([3.0, 6.5, 5.0, 1000.0, 0.0, 0.7])
+        # +1 fires above the threshold, -1 below; temperature uses abs()
+        self._factor_directions = np.array([1.0, -1.0, 1.0, 1.0, 1.0, 1.0])
+        self._factor_names = np.array([
+            "High symptom density in the area",
+            "Poor water quality detected",
+            "Unusual temperature patterns",
+            "High population density",
+            "Recent outbreak history in the area",
+            "Seasonal risk factors present",
+        ], dtype=object)
     
     async def load_or_train(self):
         """Load existing model or train new one"""
@@ -75,13 +254,17 @@ class OutbreakPredictor:
     async def load_model(self):
         """Load pre-trained model from disk"""
         try:
-            model_data = joblib.load(self.model_path)
+            loop = asyncio.get_running_loop()
+            model_data = await loop.run_in_executor(None, joblib.load, self.model_path)
             self.model = model_data['model']
             self.scaler = model_data['scaler']
             self.label_encoder = model_data['label_encoder']
             self.feature_columns = model_data['feature_columns']
             self.version = model_data.get('version', '1.0.0')
             self.last_trained = model_data.get('last_trained')
+            self._build_feature_index()
+            self._load_compiled_model()
+            self._load_onnx()
             
             logger.info("Outbreak predictor model loaded", version=self.version)
             
@@ -103,7 +286,14 @@ class OutbreakPredictor:
                 'feature_weights': self.feature_weights
             }
             
-            joblib.dump(model_data, self.model_path)
+            # LZ4 decompresses at GB/s, so the smaller file loads faster too
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None,
+                lambda: joblib.dump(model_data, self.model_path, compress=_DUMP_COMPRESS)
+            )
+            self._export_compiled_model()
+            self._export_onnx()
             logger.info("Outbreak predictor model saved", path=str(self.model_path))
             
         except Exception as e:
@@ -124,43 +314,44 @@ class OutbreakPredictor:
             # Prepare features
             X_processed, feature_columns = self._prepare_features(X)
             self.feature_columns = feature_columns
+            self._build_feature_index()
             
             # Split data
             X_train, X_test, y_train, y_test = train_test_split(
                 X_processed, y, test_size=0.2, random_state=42, stratify=y
             )
             
-            # Create preprocessing pipeline
-            numeric_features = X_processed.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_features = X_processed.select_dtypes(include=['object']).columns.tolist()
-            
-            preprocessor = ColumnTransformer(
-                transformers=[
-                    ('num', StandardScaler(), numeric_features),
-                    ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-                ]
-            )
-            
-            # Create model pipeline
+            # Histogram gradient boosting: no scaler or one-hot blow-up needed,
+            # and bin-based split evaluation is far faster to fit and predict
+            # than the previous ColumnTransformer + RandomForest pipeline
             model_params = parameters or {
                 'n_estimators': 100,
                 'max_depth': 10,
-                'min_samples_split': 5,
-                'min_samples_leaf': 2,
                 'random_state': 42
             }
             
-            self.model = Pipeline([
-                ('preprocessor', preprocessor),
-                ('classifier', RandomForestClassifier(**model_params))
-            ])
+            # Categorical columns arrive integer-coded against the fixed
+            # vocabularies and are split on as plain numerics: native
+            # categorical splits cannot be translated by the compiled
+            # backends (treelite refuses them, skl2onnx silently converts
+            # them as threshold splits with different semantics)
+            self.model = HistGradientBoostingClassifier(
+                max_iter=model_params.get('n_estimators', 100),
+                max_depth=model_params.get('max_depth', 10),
+                early_stopping=True,
+                random_state=model_params.get('random_state', 42)
+            )
             
-            # Train model
-            self.model.fit(X_train, y_train)
+            # Train model off the event loop; warning suppression is scoped to
+            # the fit instead of being a process-wide import side effect
+            loop = asyncio.get_running_loop()
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=FutureWarning)
+                await loop.run_in_executor(None, self.model.fit, X_train, y_train)
             
             # Evaluate model
-            train_score = self.model.score(X_train, y_train)
-            test_score = self.model.score(X_test, y_test)
+            train_score = await loop.run_in_executor(None, self.model.score, X_train, y_train)
+            test_score = await loop.run_in_executor(None, self.model.score, X_test, y_test)
             
             logger.info("Outbreak predictor training completed",
                        train_score=train_score,
@@ -182,93 +373,279 @@ class OutbreakPredictor:
     
     async def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Make outbreak prediction"""
+        if self.model is not None and self._feature_index is not None:
+            return self._predict_single(data)
+        results = await self.predict_batch([data])
+        return results[0]
+    
+    def _predict_single(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Single-record fast path using the preallocated row buffer"""
         try:
-            if self.model is None:
-                raise ValueError("Model not loaded or trained")
-            
-            # Prepare input features
             features = self._extract_features(data)
-            features_df = pd.DataFrame([features])
+            row = self._fill_row(features)
+            prediction_proba = self._predict_proba_rows(row)[0]
+            prediction_class = int(np.argmax(prediction_proba))
+            return self._build_result(features, prediction_class, prediction_proba)
             
-            # Ensure all required features are present
-            for col in self.feature_columns:
-                if col not in features_df.columns:
-                    features_df[col] = 0
-            
-            # Reorder columns to match training data
-            features_df = features_df[self.feature_columns]
-            
-            # Make prediction
-            prediction_proba = self.model.predict_proba(features_df)[0]
-            prediction_class = self.model.predict(features_df)[0]
-            
-            # Map prediction to risk levels
-            risk_levels = ['low', 'medium', 'high']
-            risk_level = risk_levels[prediction_class]
-            confidence = max(prediction_proba)
-            
-            # Calculate probability scores
-            probability_scores = {
-                'low': prediction_proba[0],
-                'medium': prediction_proba[1],
-                'high': prediction_proba[2]
-            }
+        except Exception as e:
+            logger.error("Outbreak prediction failed", error=str(e))
+            raise
+    
+    async def predict_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Predict outbreak risk for multiple records with a single model call"""
+        try:
+            if self.model is None:
+                raise ValueError("Model not loaded or trained")
             
-            # Identify contributing factors
-            contributing_factors = self._identify_contributing_factors(features)
+            # Prepare input features for all records at once
+            feature_dicts = [self._extract_features(record) for record in records]
+            features_df = pd.DataFrame(feature_dicts).reindex(
+                columns=self.feature_columns, fill_value=0
+            )
             
-            # Generate recommendations
-            recommendations = self._generate_recommendations(risk_level, features)
+            # One model call amortizes sklearn's per-call overhead across records
+            prediction_classes, prediction_probas = self._predict_frame(features_df)
             
-            return {
-                'risk_level': risk_level,
-                'confidence': float(confidence),
-                'probability_scores': probability_scores,
-                'contributing_factors': contributing_factors,
-                'recommendations': recommendations,
-                'model_version': self.version,
-                'timestamp': datetime.now().isoformat()
-            }
+            return [
+                self._build_result(features, prediction_class, prediction_proba)
+                for features, prediction_class, prediction_proba in zip(
+                    feature_dicts, prediction_classes, prediction_probas
+                )
+            ]
             
         except Exception as e:
             logger.error("Outbreak prediction failed", error=str(e))
             raise
     
+    def _build_result(self, features: Dict[str, Any], prediction_class: int,
+                      prediction_proba: np.ndarray) -> Dict[str, Any]:
+        """Assemble the response payload for one prediction"""
+        risk_level = _RISK_LABELS[prediction_class]
+        
+        # One C-level pass converts the whole vector to Python floats;
+        # indexing the resulting list avoids per-element numpy scalar casts
+        probs = prediction_proba.tolist()
+        probability_scores = dict(zip(_RISK_LABELS, probs))
+        
+        return {
+            'risk_level': risk_level,
+            'confidence': probs[prediction_class],
+            'probability_scores': probability_scores,
+            'contributing_factors': self._identify_contributing_factors(features),
+            'recommendations': self._generate_recommendations(risk_level, features),
+            'model_version': self.version,
+            'timestamp': _cached_now().isoformat()
+        }
+    
+    def _export_compiled_model(self):
+        """Compile the trained model into a Treelite shared library"""
+        if not TREELITE_AVAILABLE:
+            return
+        try:
+            tl_model = treelite.sklearn.import_model(self.model)
+        except NotImplementedError as e:
+            # Model uses constructs treelite cannot translate; stay on the
+            # sklearn path without warning on every save
+            logger.info("Model not importable by Treelite, skipping compiled export", reason=str(e))
+            return
+        try:
+            tl_model.export_lib(
+                toolchain='gcc',
+                libpath=str(self.model_path.with_suffix('.so')),
+                params={'parallel_comp': 4}
+            )
+            # Checkpoint consumed by the GPU ForestInference backend
+            tl_model.serialize(str(self.model_path.with_suffix('.tl')))
+            self._load_compiled_model()
+        except Exception as e:
+            logger.warning("Treelite export failed, keeping sklearn inference", error=str(e))
+    
+    def _load_compiled_model(self):
+        """Load the compiled Treelite library if it exists"""
+        if not TREELITE_AVAILABLE:
+            return
+        lib_path = self.model_path.with_suffix('.so')
+        if not lib_path.exists():
+            return
+        try:
+            self._tl_predictor = treelite_runtime.Predictor(str(lib_path), nthread=1)
+            logger.info("Loaded compiled Treelite model", path=str(lib_path))
+        except Exception as e:
+            logger.warning("Failed to load Treelite model, keeping sklearn inference", error=str(e))
+            self._tl_predictor = None
+        
+        # GPU backend: sparse storage avoids the dense-layout slowdown for
+        # the deep (max_depth=10) trees this trainer configures
+        tl_path = self.model_path.with_suffix('.tl')
+        if FIL_AVAILABLE and tl_path.exists():
+            try:
+                self._fil = ForestInference.load(
+                    str(tl_path), output_class=True, storage_type='sparse'
+                )
+                logger.info("Loaded FIL GPU model", path=str(tl_path))
+            except Exception as e:
+                logger.warning("Failed to load FIL GPU model", error=str(e))
+                self._fil = None
+    
+    def _export_onnx(self):
+        """Convert the fitted model to an ONNX graph beside the pickle"""
+        if not ONNX_AVAILABLE or not self.feature_columns:
+            return
+        try:
+            n_features = len(self.feature_columns)
+            sample = np.zeros((1, n_features), dtype=np.float32)
+            onx = to_onnx(self.model, sample, target_opset=17, options={'zipmap': False})
+            
+            # skl2onnx converts some sklearn constructs without error but
+            # with different semantics; only prefer the graph if it
+            # reproduces sklearn's probabilities on a reference batch
+            graph = onx.SerializeToString()
+            check = np.random.default_rng(42).standard_normal((256, n_features)).astype(np.float32)
+            session = ort.InferenceSession(graph, providers=['CPUExecutionProvider'])
+            onnx_probas = session.run(None, {session.get_inputs()[0].name: check})[1]
+            sk_probas = self.model.predict_proba(check.astype(np.float64))
+            drift = float(np.max(np.abs(onnx_probas - sk_probas)))
+            if drift > 1e-4:
+                logger.warning("ONNX graph failed parity check, keeping existing inference path",
+                               max_abs_diff=drift)
+                return
+            
+            self.model_path.with_suffix('.onnx').write_bytes(graph)
+            self._load_onnx()
+        except Exception as e:
+            logger.warning("ONNX export failed, keeping existing inference path", error=str(e))
+    
+    def _load_onnx(self):
+        """Load the ONNX graph into an onnxruntime CPU session if present"""
+        if not ONNX_AVAILABLE:
+            return
+        onx_path = self.model_path.with_suffix('.onnx')
+        if not onx_path.exists():
+            return
+        try:
+            self._onnx_session = ort.InferenceSession(
+                str(onx_path), providers=['CPUExecutionProvider']
+            )
+            logger.info("Loaded ONNX model", path=str(onx_path))
+        except Exception as e:
+            logger.warning("Failed to load ONNX model, keeping existing inference path", error=str(e))
+            self._onnx_session = None
+    
+    def predict_batch_gpu(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Batch prediction on GPU via cuML ForestInference"""
+        if self._fil is None:
+            raise ValueError("FIL GPU backend not available")
+        
+        feature_dicts = [self._extract_features(record) for record in records]
+        features_df = self._encode_categoricals(
+            pd.DataFrame(feature_dicts).reindex(columns=self.feature_columns, fill_value=0)
+        )
+        
+        # Column-major float32 is FIL's preferred device layout
+        gpu_rows = cp.asarray(features_df.to_numpy(dtype=np.float32), order='F')
+        prediction_probas = cp.asnumpy(self._fil.predict_proba(gpu_rows))
+        prediction_classes = np.argmax(prediction_probas, axis=1)
+        
+        return [
+            self._build_result(features, int(prediction_class), prediction_proba)
+            for features, prediction_class, prediction_proba in zip(
+                feature_dicts, prediction_classes, prediction_probas
+            )
+        ]
+    
+    def _predict_proba_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Class probabilities via the fastest loaded backend (ORT > Treelite > sklearn)"""
+        if self._onnx_session is not None:
+            input_name = self._onnx_session.get_inputs()[0].name
+            return self._onnx_session.run(
+                None, {input_name: rows.astype(np.float32, copy=False)}
+            )[1]
+        if self._tl_predictor is not None:
+            return self._tl_predictor.predict(
+                treelite_runtime.DMatrix(rows.astype(np.float32, copy=False))
+            )
+        return self.model.predict_proba(rows)
+    
+    def _build_feature_index(self):
+        """Precompute the row dtype and a reusable single-record buffer"""
+        if not self.feature_columns:
+            return
+        self._feature_index = {col: i for i, col in enumerate(self.feature_columns)}
+        # Structured record addressed by field name; the float64 view shares
+        # the same memory, so filling the record fills the model input row
+        self._row_dtype = np.dtype([(col, 'f8') for col in self.feature_columns])
+        self._row_np = np.zeros(1, dtype=self._row_dtype)
+        self._row_view = self._row_np.view(np.float64).reshape(1, -1)
+    
+    def _fill_row(self, features: Dict[str, Any]) -> np.ndarray:
+        """Fill the preallocated record buffer from a feature dict"""
+        self._row_view.fill(0)
+        fields = self._row_dtype.fields
+        for name, value in features.items():
+            if name not in fields:
+                continue
+            levels = _CATEGORY_LEVELS.get(name)
+            if levels is not None and isinstance(value, str):
+                value = levels.index(value) if value in levels else 0
+            self._row_np[name][0] = value
+        return self._row_view
+    
+    def _predict_frame(self, features_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the model once over a prepared feature frame"""
+        features_df = self._encode_categoricals(features_df)
+        prediction_probas = self._predict_proba_rows(features_df.to_numpy(dtype=np.float64))
+        # argmax over probabilities avoids a second full model traversal
+        prediction_classes = np.argmax(prediction_probas, axis=1)
+        return prediction_classes, prediction_probas
+    
+    def _encode_categoricals(self, features_df: pd.DataFrame) -> pd.DataFrame:
+        """Map categorical columns to integer codes; unseen values fall back to 0"""
+        for col, levels in _CATEGORY_LEVELS.items():
+            if col in features_df.columns and features_df[col].dtype == object:
+                codes = pd.Categorical(features_df[col], categories=levels).codes
+                features_df[col] = np.where(codes < 0, 0, codes)
+        return features_df
+    
     def _generate_synthetic_data(self) -> Tuple[pd.DataFrame, np.ndarray]:
         """Generate synthetic training data"""
         np.random.seed(42)
         n_samples = 10000
         
-        # Generate features
-        data = {
-            'symptom_density': np.random.exponential(2, n_samples),
-            'water_quality_score': np.random.normal(7.5, 1.5, n_samples),
-            'temperature_anomaly': np.random.normal(0, 3, n_samples),
-            'population_density': np.random.lognormal(8, 1, n_samples),
-            'recent_outbreaks': np.random.poisson(0.5, n_samples),
-            'seasonal_factor': np.random.uniform(0, 1, n_samples),
+        # Generate features as plain ndarrays; the DataFrame is built last so
+        # the target computation never allocates pandas Series intermediates
+        symptom_density = np.random.exponential(2, n_samples)
+        water_quality_score = np.random.normal(7.5, 1.5, n_samples)
+        temperature_anomaly = np.random.normal(0, 3, n_samples)
+        population_density = np.random.lognormal(8, 1, n_samples)
+        recent_outbreaks = np.random.poisson(0.5, n_samples)
+        seasonal_factor = np.random.uniform(0, 1, n_samples)
+        
+        # Generate target variable based on feature combinations, accumulating
+        # into one buffer to avoid a chain of temporary arrays
+        risk_score = symptom_density * 0.3
+        np.add(risk_score, (8.0 - water_quality_score) * 0.2, out=risk_score)
+        np.add(risk_score, np.abs(temperature_anomaly) * 0.1, out=risk_score)
+        np.add(risk_score, population_density * (0.2 / 1000.0), out=risk_score)
+        np.add(risk_score, recent_outbreaks * 0.1, out=risk_score)
+        np.add(risk_score, seasonal_factor * 0.1, out=risk_score)
+        
+        # Convert to risk levels in a single pass
+        y = np.digitize(risk_score, [2.0, 4.0]).astype(np.int8)
+        
+        df = pd.DataFrame({
+            'symptom_density': symptom_density,
+            'water_quality_score': water_quality_score,
+            'temperature_anomaly': temperature_anomaly,
+            'population_density': population_density,
+            'recent_outbreaks': recent_outbreaks,
+            'seasonal_factor': seasonal_factor,
             'weather_conditions': np.random.choice(['sunny', 'rainy', 'cloudy', 'stormy'], n_samples),
             'ph_level': np.random.normal(7.0, 1.0, n_samples),
             'turbidity': np.random.exponential(10, n_samples),
             'tds_level': np.random.normal(200, 100, n_samples),
             'location_type': np.random.choice(['urban', 'rural', 'suburban'], n_samples),
             'time_of_year': np.random.choice(['spring', 'summer', 'fall', 'winter'], n_samples)
-        }
-        
-        df = pd.DataFrame(data)
-        
-        # Generate target variable based on feature combinations
-        risk_score = (
-            df['symptom_density'] * 0.3 +
-            (8 - df['water_quality_score']) * 0.2 +
-            abs(df['temperature_anomaly']) * 0.1 +
-            df['population_density'] / 1000 * 0.2 +
-            df['recent_outbreaks'] * 0.1 +
-            df['seasonal_factor'] * 0.1
-        )
-        
-        # Convert to risk levels
-        y = np.where(risk_score < 2, 0, np.where(risk_score < 4, 1, 2))
+        })
         
         return df, y
     
@@ -280,19 +657,29 @@ class OutbreakPredictor:
     
     def _prepare_features(self, X: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
         """Prepare features for training"""
-        # Handle missing values
-        X_processed = X.fillna(X.median())
+        X_processed = X.copy()
         
-        # Create additional features
-        X_processed['water_quality_risk'] = np.where(
-            X_processed['water_quality_score'] < 6.5, 1, 0
-        )
-        X_processed['temperature_risk'] = np.where(
-            abs(X_processed['temperature_anomaly']) > 5, 1, 0
-        )
-        X_processed['population_risk'] = np.where(
-            X_processed['population_density'] > 1000, 1, 0
-        )
+        # Handle missing values: one nanmedian scan over the numeric block,
+        # filled in place instead of per-column fillna passes
+        numeric_cols = X_processed.select_dtypes(include=[np.number]).columns
+        arr = X_processed[numeric_cols].to_numpy(dtype=np.float64)
+        nan_mask = np.isnan(arr)
+        if nan_mask.any():
+            medians = np.nanmedian(arr, axis=0)
+            arr[nan_mask] = np.broadcast_to(medians, arr.shape)[nan_mask]
+            X_processed[numeric_cols] = arr
+        
+        # Create additional risk flags as uint8 views of the comparison masks
+        # (no intermediate float64 arrays from np.where)
+        wqs = arr[:, numeric_cols.get_loc('water_quality_score')]
+        temp = arr[:, numeric_cols.get_loc('temperature_anomaly')]
+        pop = arr[:, numeric_cols.get_loc('population_density')]
+        X_processed['water_quality_risk'] = (wqs < 6.5).view(np.uint8)
+        X_processed['temperature_risk'] = (np.abs(temp) > 5).view(np.uint8)
+        X_processed['population_risk'] = (pop > 1000).view(np.uint8)
+        
+        # Integer-code categorical columns with the fixed vocabularies
+        X_processed = self._encode_categoricals(X_processed)
         
         return X_processed, X_processed.columns.tolist()
     
@@ -304,26 +691,26 @@ class OutbreakPredictor:
         if 'sensor_data' in data and data['sensor_data']:
             sensor_data = data['sensor_data']
             
-            # Calculate water quality score
-            ph_scores = [s['ph'] for s in sensor_data if 'ph' in s]
-            turbidity_scores = [s['turbidity'] for s in sensor_data if 'turbidity' in s]
-            temp_scores = [s['temperature'] for s in sensor_data if 'temperature' in s]
-            tds_scores = [s['tds'] for s in sensor_data if 'tds' in s]
+            # Single generated-code pass over the readings computes all four
+            # field means (fields missing everywhere come back NaN and fall
+            # back to defaults below)
+            ph_mean, turbidity_mean, temp_mean, tds_mean = self._sensor_agg(sensor_data)
             
+            # Calculate water quality score
             features['water_quality_score'] = np.mean([
-                np.mean(ph_scores) if ph_scores else 7.0,
-                (100 - np.mean(turbidity_scores)) / 10 if turbidity_scores else 7.0,
-                np.mean(temp_scores) / 10 if temp_scores else 7.0,
-                (1000 - np.mean(tds_scores)) / 100 if tds_scores else 7.0
+                ph_mean if not np.isnan(ph_mean) else 7.0,
+                (100 - turbidity_mean) / 10 if not np.isnan(turbidity_mean) else 7.0,
+                temp_mean / 10 if not np.isnan(temp_mean) else 7.0,
+                (1000 - tds_mean) / 100 if not np.isnan(tds_mean) else 7.0
             ])
             
-            features['ph_level'] = np.mean(ph_scores) if ph_scores else 7.0
-            features['turbidity'] = np.mean(turbidity_scores) if turbidity_scores else 10.0
-            features['tds_level'] = np.mean(tds_scores) if tds_scores else 200.0
+            features['ph_level'] = float(ph_mean) if not np.isnan(ph_mean) else 7.0
+            features['turbidity'] = float(turbidity_mean) if not np.isnan(turbidity_mean) else 10.0
+            features['tds_level'] = float(tds_mean) if not np.isnan(tds_mean) else 200.0
             
             # Temperature anomaly
-            if temp_scores:
-                features['temperature_anomaly'] = np.mean(temp_scores) - 25.0
+            if not np.isnan(temp_mean):
+                features['temperature_anomaly'] = float(temp_mean) - 25.0
             else:
                 features['temperature_anomaly'] = 0.0
         
@@ -354,8 +741,8 @@ class OutbreakPredictor:
             features['population_density'] = 500
             features['location_type'] = 'urban'
         
-        # Time-based features
-        current_time = datetime.now()
+        # Time-based features (hourly resolution is ample for month-granular data)
+        current_time = _cached_now(3600.0)
         features['seasonal_factor'] = self._calculate_seasonal_factor(current_time)
         features['time_of_year'] = self._get_season(current_time)
         
@@ -367,13 +754,15 @@ class OutbreakPredictor:
     
     def _estimate_population_density(self, lat: float, lon: float) -> float:
         """Estimate population density based on coordinates"""
-        # Simple estimation - in real implementation, use actual population data
+        # Simple estimation - in real implementation, use actual population data.
+        # Deterministic medians of the former lognormal draws (exp(8), exp(7)):
+        # sampling the global RNG per request was slow, mutated shared state
+        # across workers, and made identical inputs score differently
         if -90 <= lat <= 90 and -180 <= lon <= 180:
             # Urban areas typically have higher population density
             if abs(lat) < 30:  # Tropical/subtropical regions
-                return np.random.lognormal(8, 1)
-            else:
-                return np.random.lognormal(7, 1)
+                return 2980.96
+            return 1096.63
         return 500
     
     def _classify_location_type(self, lat: float, lon: float) -> str:
@@ -388,77 +777,44 @@ class OutbreakPredictor:
     
     def _calculate_seasonal_factor(self, date: datetime) -> float:
         """Calculate seasonal factor for outbreak prediction"""
-        month = date.month
-        # Higher risk in certain months (e.g., flu season)
-        seasonal_risk = {
-            1: 0.8, 2: 0.9, 3: 0.7, 4: 0.5, 5: 0.4, 6: 0.3,
-            7: 0.2, 8: 0.3, 9: 0.4, 10: 0.6, 11: 0.7, 12: 0.8
-        }
-        return seasonal_risk.get(month, 0.5)
+        if _hot is not None:
+            return _hot.calculate_seasonal_factor(date.month)
+        return _SEASONAL_RISK[date.month]
     
     def _get_season(self, date: datetime) -> str:
         """Get season based on date"""
-        month = date.month
-        if month in [12, 1, 2]:
-            return 'winter'
-        elif month in [3, 4, 5]:
-            return 'spring'
-        elif month in [6, 7, 8]:
-            return 'summer'
-        else:
-            return 'fall'
+        if _hot is not None:
+            return _hot.get_season(date.month)
+        return _SEASON_NAME[date.month]
     
     def _identify_contributing_factors(self, features: Dict[str, Any]) -> List[str]:
         """Identify key contributing factors to the prediction"""
-        factors = []
-        
-        if features.get('symptom_density', 0) > 3:
-            factors.append("High symptom density in the area")
-        
-        if features.get('water_quality_score', 7) < 6.5:
-            factors.append("Poor water quality detected")
-        
-        if abs(features.get('temperature_anomaly', 0)) > 5:
-            factors.append("Unusual temperature patterns")
-        
-        if features.get('population_density', 0) > 1000:
-            factors.append("High population density")
-        
-        if features.get('recent_outbreaks', 0) > 0:
-            factors.append("Recent outbreak history in the area")
-        
-        if features.get('seasonal_factor', 0.5) > 0.7:
-            factors.append("Seasonal risk factors present")
+        if _hot is not None:
+            return _hot.identify_contributing_factors(features)
+        values = np.fromiter(
+            (features.get(key, default)
+             for key, default in zip(self._factor_keys, self._factor_defaults)),
+            dtype=np.float64, count=len(self._factor_keys)
+        )
+        values[2] = abs(values[2])  # temperature anomaly fires on magnitude
         
-        return factors[:5]  # Return top 5 factors
+        mask = (values * self._factor_directions) > (self._factor_thresholds * self._factor_directions)
+        return self._factor_names[mask][:5].tolist()  # Return top 5 factors
     
     def _generate_recommendations(self, risk_level: str, features: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on risk level and features"""
-        recommendations = []
+        if _hot is not None:
+            return _hot.generate_recommendations(risk_level, features)
         
         if risk_level == 'high':
-            recommendations.extend([
-                "Issue immediate public health alert",
-                "Increase monitoring frequency",
-                "Implement containment measures",
-                "Notify health authorities",
-                "Consider temporary restrictions"
-            ])
+            base = _RECS_HIGH
         elif risk_level == 'medium':
-            recommendations.extend([
-                "Increase surveillance in the area",
-                "Monitor water quality closely",
-                "Prepare response protocols",
-                "Inform local health workers",
-                "Track symptom patterns"
-            ])
+            base = _RECS_MEDIUM
         else:
-            recommendations.extend([
-                "Continue routine monitoring",
-                "Maintain current surveillance levels",
-                "Monitor for any changes",
-                "Keep response teams on standby"
-            ])
+            base = _RECS_LOW
+        
+        # Only materialize a list when feature-specific entries are appended
+        recommendations = list(base)
         
         # Add specific recommendations based on features
         if features.get('water_quality_score', 7) < 6.5:
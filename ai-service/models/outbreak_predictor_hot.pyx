@@ -0,0 +1,112 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled hot-path helpers for the outbreak predictor
+Statically typed versions of the per-request dict/branch heavy methods;
+outbreak_predictor.py falls back to its Python implementations when this
+extension is not built.
+
+Build in place with:
+    python setup.py build_ext --inplace
+"""
+
+# Seasonal risk indexed by month (slot 0 unused)
+cdef double SEASONAL_RISK[13]
+cdef int _i
+_seasonal_init = (0.5, 0.8, 0.9, 0.7, 0.5, 0.4, 0.3, 0.2, 0.3, 0.4, 0.6, 0.7, 0.8)
+for _i in range(13):
+    SEASONAL_RISK[_i] = _seasonal_init[_i]
+
+cdef tuple SEASON_NAMES = (
+    '', 'winter', 'winter', 'spring', 'spring', 'spring',
+    'summer', 'summer', 'summer', 'fall', 'fall', 'fall', 'winter'
+)
+
+cdef tuple RECS_HIGH = (
+    "Issue immediate public health alert",
+    "Increase monitoring frequency",
+    "Implement containment measures",
+    "Notify health authorities",
+    "Consider temporary restrictions",
+)
+cdef tuple RECS_MEDIUM = (
+    "Increase surveillance in the area",
+    "Monitor water quality closely",
+    "Prepare response protocols",
+    "Inform local health workers",
+    "Track symptom patterns",
+)
+cdef tuple RECS_LOW = (
+    "Continue routine monitoring",
+    "Maintain current surveillance levels",
+    "Monitor for any changes",
+    "Keep response teams on standby",
+)
+
+
+cpdef double calculate_seasonal_factor(int month):
+    """Seasonal outbreak risk factor for a month (1-12)"""
+    if month < 1 or month > 12:
+        return 0.5
+    return SEASONAL_RISK[month]
+
+
+cpdef str get_season(int month):
+    """Season name for a month (1-12)"""
+    if month < 1 or month > 12:
+        return 'fall'
+    return SEASON_NAMES[month]
+
+
+cpdef list identify_contributing_factors(dict features):
+    """Identify key contributing factors to the prediction"""
+    cdef list factors = []
+    cdef double value
+
+    value = features.get('symptom_density', 0)
+    if value > 3:
+        factors.append("High symptom density in the area")
+
+    value = features.get('water_quality_score', 7)
+    if value < 6.5:
+        factors.append("Poor water quality detected")
+
+    value = features.get('temperature_anomaly', 0)
+    if value > 5 or value < -5:
+        factors.append("Unusual temperature patterns")
+
+    value = features.get('population_density', 0)
+    if value > 1000:
+        factors.append("High population density")
+
+    value = features.get('recent_outbreaks', 0)
+    if value > 0:
+        factors.append("Recent outbreak history in the area")
+
+    value = features.get('seasonal_factor', 0.5)
+    if value > 0.7:
+        factors.append("Seasonal risk factors present")
+
+    return factors[:5]
+
+
+cpdef list generate_recommendations(str risk_level, dict features):
+    """Generate recommendations based on risk level and features"""
+    cdef list recommendations
+    cdef double value
+
+    if risk_level == 'high':
+        recommendations = list(RECS_HIGH)
+    elif risk_level == 'medium':
+        recommendations = list(RECS_MEDIUM)
+    else:
+        recommendations = list(RECS_LOW)
+
+    value = features.get('water_quality_score', 7)
+    if value < 6.5:
+        recommendations.append("Investigate and improve water quality")
+
+    value = features.get('symptom_density', 0)
+    if value > 2:
+        recommendations.append("Investigate symptom clusters")
+
+    return recommendations[:8]
@@ -0,0 +1,22 @@
+"""
+Build script for the compiled outbreak predictor hot path
+
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="outbreak_predictor_hot",
+    ext_modules=cythonize(
+        [
+            Extension(
+                "outbreak_predictor_hot",
+                ["outbreak_predictor_hot.pyx"],
+                extra_compile_args=["-O3"],
+            )
+        ],
+        language_level=3,
+    ),
+)